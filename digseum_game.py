@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Tuple
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import accumulate
+from random import Random
 
 from Options import OptionSet
 
@@ -17,6 +21,36 @@ class DigseumArchipelagoOptions:
     pass
 
 
+class DigseumTier(NamedTuple):
+    numbers: range
+    weight: int
+    is_time_consuming: bool
+
+
+class DigseumTieredRange:
+    """
+    The level or dream fragment tiers behind one Digseum template. Tiers can be far apart (1-16 next to 1000-5000),
+    so the draw is made over their cumulative weights rather than a pooled list of every value.
+    """
+    ranges: Tuple[range, ...]
+    weights: Tuple[int, ...]
+    cumulative_weights: Tuple[int, ...]
+
+    def __init__(self, tiers: Tuple[DigseumTier, ...]) -> None:
+        self.ranges = tuple(tier.numbers for tier in tiers)
+        self.weights = tuple(tier.weight for tier in tiers)
+        self.cumulative_weights = tuple(accumulate(self.weights))
+
+    def draw(self, random: Random) -> int:
+        point: float = random.random() * self.cumulative_weights[-1]
+
+        index: int = bisect_right(self.cumulative_weights, point)
+        offset: float = point - (self.cumulative_weights[index - 1] if index else 0)
+
+        numbers: range = self.ranges[index]
+        return numbers[min(int(offset * len(numbers) / self.weights[index]), len(numbers) - 1)]
+
+
 class DigseumGame(Game):
     name = "Digseum"
     platform = KeymastersKeepGamePlatforms.PC
@@ -51,35 +85,13 @@ class DigseumGame(Game):
                 is_difficult=False,
                 weight=5,
             ),
-            GameObjectiveTemplate(
-                label="Reach level LEVEL with RELIC",
-                data={
-                    "LEVEL": (self.small_number, 1),
-                    "RELIC": (self.relics, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=5,
-            ),
-            GameObjectiveTemplate(
+            *self.tiered_templates(
                 label="Reach level LEVEL with RELIC",
+                key="LEVEL",
+                tiers=self.relic_level_tiers(),
                 data={
-                    "LEVEL": (self.number, 1),
-                    "RELIC": (self.relics, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3,
-            ),
-            GameObjectiveTemplate(
-                label="Reach level LEVEL with RELIC",
-                data={
-                    "LEVEL": (self.large_number, 1),
-                    "RELIC": (self.relics, 1)
+                    "RELIC": (self.relics, 1),
                 },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=1,
             ),
             GameObjectiveTemplate(
                 label="Excavate ZONE NUMBER times",
@@ -91,35 +103,13 @@ class DigseumGame(Game):
                 is_difficult=False,
                 weight=5,
             ),
-            GameObjectiveTemplate(
-                label="Reach level LEVEL in ZONE",
-                data={
-                    "LEVEL": (self.small_number, 1),
-                    "ZONE": (self.zones, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=5,
-            ),
-            GameObjectiveTemplate(
-                label="Reach level LEVEL in ZONE",
-                data={
-                    "LEVEL": (self.number, 1),
-                    "ZONE": (self.zones, 1),
-                },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=3,
-            ),
-            GameObjectiveTemplate(
+            *self.tiered_templates(
                 label="Reach level LEVEL in ZONE",
+                key="LEVEL",
+                tiers=self.zone_level_tiers(),
                 data={
-                    "LEVEL": (self.large_number, 1),
                     "ZONE": (self.zones, 1),
                 },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=1,
             ),
             GameObjectiveTemplate(
                 label="Upgrade UPGRADE once",
@@ -148,35 +138,82 @@ class DigseumGame(Game):
                 is_difficult=False,
                 weight=5,
             ),
-            GameObjectiveTemplate(
-                label="Collect NUMBER dream fragments",
-                data={
-                    "NUMBER": (self.small_number, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=5,
-            ),
-            GameObjectiveTemplate(
+            *self.tiered_templates(
                 label="Collect NUMBER dream fragments",
-                data={
-                    "NUMBER": (self.number, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3,
-            ),
-            GameObjectiveTemplate(
-                label="Collect NUMBER dream fragments",
-                data={
-                    "NUMBER": (self.large_number, 1),
-                },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=1,
+                key="NUMBER",
+                tiers=self.dream_fragment_tiers(),
+                data=dict(),
             ),
         ]
 
+    def tiered_templates(
+        self,
+        label: str,
+        key: str,
+        tiers: Tuple[DigseumTier, ...],
+        data: Dict[str, Tuple[Callable, int]],
+    ) -> List[GameObjectiveTemplate]:
+        """
+        One template per time-consuming group of tiers, weighted by the sum of its tiers, so that templates can still
+        be filtered on is_time_consuming.
+        """
+        templates: List[GameObjectiveTemplate] = list()
+
+        for is_time_consuming in (False, True):
+            group: Tuple[DigseumTier, ...] = tuple(
+                tier for tier in tiers if tier.is_time_consuming == is_time_consuming
+            )
+
+            if not group:
+                continue
+
+            templates.append(
+                GameObjectiveTemplate(
+                    label=label,
+                    data={
+                        key: (partial(self.tiered_number, self.tiered_range(group)), 1),
+                        **data,
+                    },
+                    is_time_consuming=is_time_consuming,
+                    is_difficult=False,
+                    weight=sum(tier.weight for tier in group),
+                )
+            )
+
+        return templates
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def tiered_range(tiers: Tuple[DigseumTier, ...]) -> DigseumTieredRange:
+        return DigseumTieredRange(tiers)
+
+    def tiered_number(self, tiered_range: DigseumTieredRange) -> Tuple[int]:
+        return (tiered_range.draw(self.random),)
+
+    @staticmethod
+    def relic_level_tiers() -> Tuple[DigseumTier, ...]:
+        return (
+            DigseumTier(DigseumGame.small_number(), weight=5, is_time_consuming=False),
+            DigseumTier(DigseumGame.number(), weight=3, is_time_consuming=False),
+            DigseumTier(DigseumGame.large_number(), weight=1, is_time_consuming=True),
+        )
+
+    @staticmethod
+    def zone_level_tiers() -> Tuple[DigseumTier, ...]:
+        return (
+            DigseumTier(DigseumGame.small_number(), weight=5, is_time_consuming=False),
+            DigseumTier(DigseumGame.number(), weight=3, is_time_consuming=True),
+            DigseumTier(DigseumGame.large_number(), weight=1, is_time_consuming=True),
+        )
+
+    @staticmethod
+    def dream_fragment_tiers() -> Tuple[DigseumTier, ...]:
+        return (
+            DigseumTier(DigseumGame.small_number(), weight=5, is_time_consuming=False),
+            DigseumTier(DigseumGame.number(), weight=3, is_time_consuming=False),
+            DigseumTier(DigseumGame.large_number(), weight=1, is_time_consuming=True),
+        )
+
     @staticmethod
     def relics() -> List[str]:
         return [
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
+import json
+import pkgutil
+import unicodedata
+
+from bisect import bisect_left
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import accumulate, combinations
+from math import comb
+from random import Random
 
 from Options import OptionSet
 
@@ -12,9 +21,203 @@ from ..game_objective_template import GameObjectiveTemplate
 from ..enums import KeymastersKeepGamePlatforms
 
 
+def distinct_combinations(pool: Sequence[str], size: int, conjunction: str = "or") -> Tuple[str, ...]:
+    """
+    Every unordered selection of size distinct entries from pool, joined for display as a single value.
+
+    Lets a template draw several slots over the same pool in one draw without ever repeating an entry.
+    """
+    return tuple(
+        f"{', '.join(combination[:-1])} {conjunction} {combination[-1]}"
+        for combination in combinations(pool, size)
+    )
+
+
+class MTGCardCombinations(Sequence):
+    """
+    Every unordered selection of size cards from a pool, in lexicographic order.
+
+    Selections are unranked from their index when read, so distinct selections can be drawn by index without storing
+    all of them or retrying duplicates.
+    """
+    pool: Tuple[str, ...]
+    size: int
+
+    def __init__(self, pool: Sequence[str], size: int) -> None:
+        self.pool = tuple(pool)
+        self.size = size
+
+    def __len__(self) -> int:
+        return comb(len(self.pool), self.size)
+
+    def __getitem__(self, index: int) -> str:
+        rank: int = range(len(self))[index]
+
+        cards: List[str] = list()
+        card: int = 0
+
+        while len(cards) < self.size:
+            # Number of selections that start with this card, given the cards chosen so far
+            count: int = comb(len(self.pool) - card - 1, self.size - len(cards) - 1)
+
+            if rank < count:
+                cards.append(self.pool[card])
+            else:
+                rank -= count
+
+            card += 1
+
+        return ", ".join(cards)
+
+
+class MTGDistinctDraws:
+    """
+    BAD_CARDS selections for one world, one per call, without repeating a selection before all of them were used.
+
+    Every call advances a partial Fisher-Yates shuffle of the combination ranks by one step, keeping only the ranks
+    it displaced, so nothing proportional to C(16, 3) is built or shuffled up front.
+    """
+    pool: Sequence[str]
+    random: Random
+    swaps: Dict[int, int]  # Position -> index, only for positions that no longer hold their own index
+    drawn: int
+
+    def __init__(self, pool: Sequence[str], random: Random) -> None:
+        self.pool = pool
+        self.random = random
+
+        self.swaps = dict()
+        self.drawn = 0
+
+    def __call__(self) -> Tuple[str]:
+        if self.drawn == len(self.pool):
+            self.swaps.clear()
+            self.drawn = 0
+
+        position: int = self.random.randrange(self.drawn, len(self.pool))
+        index: int = self.swaps.get(position, position)
+
+        # The first undrawn index takes the place of the one drawn, as in Fisher-Yates
+        self.swaps[position] = self.swaps.pop(self.drawn, self.drawn)
+        self.drawn += 1
+
+        return (self.pool[index],)
+
+
+class MTGAliasTable:
+    """
+    Weighted pool sampled in constant time with Walker's alias method.
+
+    Each slot holds an item, the probability of keeping it, and the item to take instead. A draw picks a slot uniformly
+    and flips one biased coin, no matter how many items or how skewed the weights are.
+    """
+    items: Tuple[str, ...]
+    probabilities: Tuple[float, ...]
+    aliases: Tuple[int, ...]
+
+    def __init__(self, items: Sequence[str], weights: Sequence[float]) -> None:
+        self.items = tuple(items)
+
+        total: float = sum(weights)
+        scaled: List[float] = [weight * len(weights) / total for weight in weights]
+
+        probabilities: List[float] = [1.0] * len(weights)
+        aliases: List[int] = list(range(len(weights)))
+
+        small: List[int] = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large: List[int] = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+
+        while small and large:
+            less: int = small.pop()
+            more: int = large.pop()
+
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(aliases)
+
+    def draw(self, random: Random) -> str:
+        slot: int = random.randrange(len(self.items))
+
+        if random.random() < self.probabilities[slot]:
+            return self.items[slot]
+
+        return self.items[self.aliases[slot]]
+
+
+# Apostrophe and quote variants found in card names, folded to their ASCII forms before matching
+quote_translation: Dict[int, str] = str.maketrans({
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u02bc": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+})
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", name).translate(quote_translation).casefold().split())
+
+
+class MTGNameIndex:
+    """
+    Normalized lookup over MTG names: exact matches are a dict lookup, prefix matches a bisect over the sorted keys.
+
+    Each face of a double-faced card is indexed as well and resolves to the full card name.
+    """
+    names: Dict[str, str]
+    keys: Tuple[str, ...]
+
+    def __init__(self, *pools: Sequence[str]) -> None:
+        self.names = dict()
+
+        for pool in pools:
+            for name in pool:
+                for key in [name] + name.split(" // "):
+                    self.names.setdefault(normalize_name(key), name)
+
+        self.keys = tuple(sorted(self.names))
+
+    def lookup(self, name: str) -> Optional[str]:
+        return self.names.get(normalize_name(name))
+
+    def lookup_prefix(self, prefix: str) -> Tuple[str, ...]:
+        key: str = normalize_name(prefix)
+        start: int = bisect_left(self.keys, key)
+
+        matches: Dict[str, None] = dict()
+
+        for i in range(start, len(self.keys)):
+            if not self.keys[i].startswith(key):
+                break
+
+            matches[self.names[self.keys[i]]] = None
+
+        return tuple(matches)
+
+
+FORMAT_COMMANDER: int = 1 << 0
+FORMAT_NON_COMMANDER: int = 1 << 1
+FORMAT_ANY: int = FORMAT_COMMANDER | FORMAT_NON_COMMANDER
+
+format_flags: Dict[str, int] = {
+    "Commander": FORMAT_COMMANDER,
+    "Non-Commander": FORMAT_NON_COMMANDER,
+}
+
+
 @dataclass
 class MTGArchipelagoOptions:
-    pass
+    magic_the_gathering_formats_played: MTGFormatsPlayed
+
+
+class MTGTemplateTable(NamedTuple):
+    templates: Tuple[GameObjectiveTemplate, ...]
+    cumulative_weights: Tuple[int, ...]
 
 
 class MTGGame(Game):
@@ -35,6 +238,50 @@ class MTGGame(Game):
         return list()
 
     def game_objective_templates(self) -> List[GameObjectiveTemplate]:
+        return list(self.objective_template_table.templates)
+
+    @cached_property
+    def formats_played(self) -> int:
+        mask: int = 0
+        for format_played in self.archipelago_options.magic_the_gathering_formats_played.value:
+            mask |= format_flags[format_played]
+
+        # Selecting no format at all is treated the same as playing every format
+        return mask or FORMAT_ANY
+
+    @property
+    def plays_commander(self) -> bool:
+        return bool(self.formats_played & FORMAT_COMMANDER)
+
+    @cached_property
+    def objective_template_table(self) -> MTGTemplateTable:
+        templates: List[GameObjectiveTemplate] = [
+            template for formats, template in self.tagged_objective_templates() if formats & self.formats_played
+        ]
+
+        return MTGTemplateTable(
+            templates=tuple(templates),
+            cumulative_weights=tuple(accumulate(template.weight for template in templates)),
+        )
+
+    def tagged_objective_templates(self) -> List[Tuple[int, GameObjectiveTemplate]]:
+        commander_templates: List[GameObjectiveTemplate] = [
+            GameObjectiveTemplate(
+                label="Cast your commander NUMBER times",
+                data={
+                    "NUMBER": (self.small_amount, 1),
+                },
+                is_time_consuming=False,
+                is_difficult=False,
+                weight=1,
+            ),
+        ]
+
+        return [(FORMAT_ANY, template) for template in self.any_format_objective_templates()] + [
+            (FORMAT_COMMANDER, template) for template in commander_templates
+        ]
+
+    def any_format_objective_templates(self) -> List[GameObjectiveTemplate]:
         return [
             GameObjectiveTemplate(
                 label="Attack with NUMBER creatures",
@@ -83,44 +330,24 @@ class MTGGame(Game):
                 weight=3,
             ),
             GameObjectiveTemplate(
-                label="Cast NUMBER COLOR_1 or COLOR_2 spells",
+                label="Cast NUMBER COLORS spells",
                 data={
                     "NUMBER": (self.large_amount, 1),
-                    "COLOR_1": (self.colors, 1),
-                    "COLOR_2": (self.colors, 1),
+                    "COLORS": (self.color_pairs, 1),
                 },
                 is_time_consuming=False,
                 is_difficult=False,
                 weight=5,
             ),
-            GameObjectiveTemplate(
-                label="Cast your commander NUMBER times",
-                data={
-                    "NUMBER": (self.small_amount, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
-            GameObjectiveTemplate(
-                label="Cast a(n) TYPE NUMBER times",
-                data={
-                    "TYPE": (self.common_creature_types, 1),
-                    "NUMBER": (self.medium_amount, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3,
-            ),
             GameObjectiveTemplate(
                 label="Cast a(n) TYPE NUMBER times",
                 data={
-                    "TYPE": (self.rare_creature_types, 1),
+                    "TYPE": (self.weighted_creature_type, 1),
                     "NUMBER": (self.small_amount, 1),
                 },
                 is_time_consuming=False,
                 is_difficult=False,
-                weight=2,
+                weight=5,
             ),
             GameObjectiveTemplate(
                 label="Create NUMBER tokens",
@@ -153,7 +380,7 @@ class MTGGame(Game):
             GameObjectiveTemplate(
                 label="Win a game via ALT_WIN_CON",
                 data={
-                    "ALT_WIN_CON": (self.alternative_win_types, 1),
+                    "ALT_WIN_CON": (self.win_types, 1),
                 },
                 is_time_consuming=False,
                 is_difficult=False,
@@ -162,7 +389,7 @@ class MTGGame(Game):
             GameObjectiveTemplate(
                 label="Play a game using BAD_CARDS",
                 data={
-                    "BAD_CARDS": (self.bad_cards, 3),
+                    "BAD_CARDS": (self.bad_card_draws, 1),
                 },
                 is_time_consuming=False,
                 is_difficult=False,
@@ -183,19 +410,24 @@ class MTGGame(Game):
         return range(1, 6)
 
     @staticmethod
-    def colors() -> List[str]:
-        return [
+    def colors() -> Tuple[str, ...]:
+        return (
             "White",
             "Blue",
             "Black",
             "Red",
             "Green",
             "Colorless",
-        ]
+        )
 
     @staticmethod
-    def card_types() -> List[str]:
-        return [
+    @lru_cache(maxsize=None)
+    def color_pairs() -> Tuple[str, ...]:
+        return distinct_combinations(MTGGame.colors(), 2)
+
+    @staticmethod
+    def card_types() -> Tuple[str, ...]:
+        return (
             "Artifact",
             "Battle",
             "Creature",
@@ -204,20 +436,22 @@ class MTGGame(Game):
             "Kindred",
             "Planeswalker",
             "Sorcery",
-        ]
+        )
 
     @staticmethod
-    def land() -> List[str]:
-        return [
-            "Land"
-        ]
+    def land() -> Tuple[str, ...]:
+        return (
+            "Land",
+        )
 
-    def all_types(self) -> List[str]:
-        return self.card_types() + self.land()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def all_types() -> Tuple[str, ...]:
+        return MTGGame.card_types() + MTGGame.land()
 
     @staticmethod
-    def common_creature_types() -> List[str]:
-        return [
+    def common_creature_types() -> Tuple[str, ...]:
+        return (
             "Angel",
             "Beast",
             "Bird",
@@ -250,11 +484,11 @@ class MTGGame(Game):
             "Warrior",
             "Wizard",
             "Zombie",
-        ]
+        )
 
     @staticmethod
-    def rare_creature_types() -> List[str]:
-        return [
+    def rare_creature_types() -> Tuple[str, ...]:
+        return (
             "Advisor",
             "Aetherborn",
             "Alien",
@@ -523,14 +757,53 @@ class MTGGame(Game):
             "Wurm",
             "Yeti",
             "Zubera",
-        ]
+        )
 
-    def creature_types(self) -> List[str]:
-        return self.common_creature_types() + self.rare_creature_types()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def type_pools() -> Dict[str, Dict[str, int]]:
+        # Generated by magic_the_gathering_type_pools.py from a card database dump. When it is not shipped, the
+        # hand-maintained type lists below are used instead.
+        try:
+            data: Optional[bytes] = pkgutil.get_data(__package__, "magic_the_gathering_type_pools.json")
+        except OSError:
+            return dict()
+
+        return json.loads(data) if data else dict()
 
     @staticmethod
-    def artifact_types() -> List[str]:
-        return [
+    @lru_cache(maxsize=None)
+    def type_pool(category: str) -> Tuple[str, ...]:
+        return tuple(MTGGame.type_pools().get(category, dict()))
+
+    def weighted_creature_type(self) -> Tuple[str]:
+        return (self.creature_type_table().draw(self.random),)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def creature_type_table() -> MTGAliasTable:
+        counts: Dict[str, int] = MTGGame.type_pools().get("creature", dict())
+
+        if counts:
+            return MTGAliasTable(tuple(counts), tuple(counts.values()))
+
+        # Without card counts, common types share 3/5 of the weight and rare types 2/5
+        common: Tuple[str, ...] = MTGGame.common_creature_types()
+        rare: Tuple[str, ...] = MTGGame.rare_creature_types()
+
+        return MTGAliasTable(
+            common + rare,
+            (3 * len(rare),) * len(common) + (2 * len(common),) * len(rare),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def creature_types() -> Tuple[str, ...]:
+        return MTGGame.type_pool("creature") or MTGGame.common_creature_types() + MTGGame.rare_creature_types()
+
+    @staticmethod
+    def artifact_types() -> Tuple[str, ...]:
+        return MTGGame.type_pool("artifact") or (
             "Blood",
             "Clue",
             "Equipment",
@@ -541,11 +814,11 @@ class MTGGame(Game):
             "Powerstone",
             "Treasure",
             "Vehicle",
-        ]
+        )
 
     @staticmethod
-    def enchantment_types() -> List[str]:
-        return [
+    def enchantment_types() -> Tuple[str, ...]:
+        return MTGGame.type_pool("enchantment") or (
             "Aura",
             "Background",
             "Cartouche",
@@ -557,21 +830,24 @@ class MTGGame(Game):
             "Rune",
             "Saga",
             "Shrine",
-        ]
+        )
 
     @staticmethod
-    def basic_land_types() -> List[str]:
-        return [
+    def basic_land_types() -> Tuple[str, ...]:
+        return (
             "Plains",
             "Island",
             "Swamp",
             "Mountain",
             "Forest",
-        ]
+        )
 
     @staticmethod
-    def land_types() -> List[str]:
-        return [
+    @lru_cache(maxsize=None)
+    def land_types() -> Tuple[str, ...]:
+        basic_land_types: Tuple[str, ...] = MTGGame.basic_land_types()
+
+        return tuple(land for land in MTGGame.type_pool("land") if land not in basic_land_types) or (
             "Cave",
             "Desert",
             "Gate",
@@ -582,26 +858,40 @@ class MTGGame(Game):
             "Sphere",
             "Tower",
             "Urza's",
-        ]
+        )
 
-    def all_land_types(self) -> List[str]:
-        return self.basic_land_types() + self.land_types()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def all_land_types() -> Tuple[str, ...]:
+        return MTGGame.basic_land_types() + MTGGame.land_types()
 
-    def all_sub_types(self) -> List[str]:
-        return self.creature_types() + self.artifact_types() + self.enchantment_types()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def all_sub_types() -> Tuple[str, ...]:
+        return MTGGame.creature_types() + MTGGame.artifact_types() + MTGGame.enchantment_types()
 
     @staticmethod
-    def alternative_win_types() -> List[str]:
-        return [
+    def alternative_win_types() -> Tuple[str, ...]:
+        return (
             "Life Loss",
             "Mill",
             "Poison",
+        )
+
+    @staticmethod
+    def commander_win_types() -> Tuple[str, ...]:
+        return (
             "Commander Damage",
-        ]
+        )
+
+    def win_types(self) -> Tuple[str, ...]:
+        if self.plays_commander:
+            return self.alternative_win_types() + self.commander_win_types()
+        return self.alternative_win_types()
 
     @staticmethod
-    def alternative_win_cards() -> List[str]:
-        return [
+    def alternative_win_cards() -> Tuple[str, ...]:
+        return (
             "Approach of the Second Sun",
             "Azor's Elocutors",
             "Barren Glory",
@@ -637,23 +927,49 @@ class MTGGame(Game):
             "Triskaidekaphile",
             "Twenty-Toed Toad",
             "Zenos yae Galvus // Shinryu, Transcendent Rival",
-        ]
+        )
 
     @staticmethod
-    def acorn_win_conditions() -> List[str]:
-        return [
+    def acorn_win_conditions() -> Tuple[str, ...]:
+        return (
             "As Luck Would Have It",
             "Form of the Approach of the Second Sun",
             "Now I Know My ABC's",
             "The Cheese Stands Alone",
-        ]
+        )
 
-    def alternative_win_conditions(self) -> List[str]:
-        return self.alternative_win_types() + self.alternative_win_cards()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def alternative_win_conditions() -> Tuple[str, ...]:
+        return MTGGame.alternative_win_types() + MTGGame.alternative_win_cards()
+
+    @cached_property
+    def bad_card_draws(self) -> MTGDistinctDraws:
+        # Per world, so a game's BAD_CARDS objectives only repeat a triple once all 560 were used
+        return MTGDistinctDraws(self.bad_card_combinations(), self.random)
 
     @staticmethod
-    def bad_cards() -> List[str]:
-        return [
+    @lru_cache(maxsize=None)
+    def bad_card_combinations() -> MTGCardCombinations:
+        return MTGCardCombinations(MTGGame.bad_cards(), 3)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def name_index() -> MTGNameIndex:
+        return MTGNameIndex(
+            MTGGame.colors(),
+            MTGGame.all_types(),
+            MTGGame.all_sub_types(),
+            MTGGame.all_land_types(),
+            MTGGame.alternative_win_conditions(),
+            MTGGame.commander_win_types(),
+            MTGGame.acorn_win_conditions(),
+            MTGGame.bad_cards(),
+        )
+
+    @staticmethod
+    def bad_cards() -> Tuple[str, ...]:
+        return (
             "Alabaster Leech",
             "Apocalypse Chime",
             "Bargain",
@@ -670,4 +986,18 @@ class MTGGame(Game):
             "Sorrow's Path",
             "Wood Elemental",
             "Zephyr Spirit",
-        ]
+        )
+
+
+# Archipelago Options
+class MTGFormatsPlayed(OptionSet):
+    """
+    Indicates which Magic the Gathering formats the player plays. Commander-only objectives require Commander.
+    """
+    display_name = "Magic the Gathering Formats Played"
+    valid_keys = [
+        "Commander",
+        "Non-Commander",
+    ]
+
+    default = valid_keys
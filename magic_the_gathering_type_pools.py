@@ -0,0 +1,154 @@
+"""
+Builds magic_the_gathering_type_pools.json from a local Scryfall bulk data dump.
+
+The dump is parsed incrementally, one card object at a time, so multi-hundred-MB files never have to fit in memory.
+The output maps each subtype category to its subtypes and how many distinct cards carry them.
+
+Usage: python magic_the_gathering_type_pools.py <bulk-data.json> [output.json]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterator, Set, TextIO, Tuple
+
+
+CATEGORIES: Dict[str, str] = {
+    "Creature": "creature",
+    "Kindred": "creature",
+    "Tribal": "creature",
+    "Artifact": "artifact",
+    "Enchantment": "enchantment",
+    "Land": "land",
+}
+
+# Layouts that are not cards you can put in a deck
+IGNORED_LAYOUTS: Set[str] = {
+    "art_series",
+    "double_faced_token",
+    "emblem",
+    "token",
+}
+
+IGNORED_SET_TYPES: Set[str] = {
+    "funny",
+    "memorabilia",
+    "token",
+}
+
+CHUNK_SIZE: int = 1 << 20
+
+
+def iter_json_array(file: TextIO) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array, decoding one element at a time from fixed size chunks.
+    """
+    decoder: json.JSONDecoder = json.JSONDecoder()
+
+    buffer: str = ""
+    position: int = 0
+    exhausted: bool = False
+
+    while True:
+        # Skip whitespace and the array punctuation between elements
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+
+        if position < len(buffer):
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield element
+                continue
+
+        if exhausted:
+            return
+
+        chunk: str = file.read(CHUNK_SIZE)
+        exhausted = not chunk
+
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def split_type_line(type_line: str) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    types, _, subtypes = type_line.partition(" — ")
+    categories: FrozenSet[str] = frozenset(CATEGORIES[word] for word in types.split() if word in CATEGORIES)
+
+    return categories, tuple(subtypes.split())
+
+
+def build_type_pools(file: TextIO) -> Dict[str, Dict[str, int]]:
+    seen: Set[str] = set()
+
+    counts: Counter = Counter()
+    ambiguous_counts: Counter = Counter()
+
+    for card in iter_json_array(file):
+        if card.get("layout") in IGNORED_LAYOUTS or card.get("set_type") in IGNORED_SET_TYPES:
+            continue
+
+        # Printings of the same card share an oracle id; only the first one is counted
+        card_id: str = card.get("oracle_id") or card.get("name", "")
+
+        if card_id in seen:
+            continue
+
+        seen.add(card_id)
+
+        card_subtypes: Set[Tuple[FrozenSet[str], str]] = set()
+
+        for type_line in card.get("type_line", "").split(" // "):
+            categories, subtypes = split_type_line(type_line)
+
+            for subtype in subtypes:
+                card_subtypes.add((categories, subtype))
+
+        for categories, subtype in card_subtypes:
+            if len(categories) == 1:
+                counts[(next(iter(categories)), subtype)] += 1
+            elif categories:
+                ambiguous_counts[(categories, subtype)] += 1
+
+    # A subtype on a multi-type card (e.g. Artifact Creature) belongs to whichever of its categories already uses it
+    for (categories, subtype), count in ambiguous_counts.items():
+        matches = [category for category in sorted(categories) if (category, subtype) in counts]
+        category: str = matches[0] if matches else ("creature" if "creature" in categories else min(categories))
+
+        counts[(category, subtype)] += count
+
+    pools: Dict[str, Dict[str, int]] = {category: dict() for category in sorted(set(CATEGORIES.values()))}
+
+    for (category, subtype), count in sorted(counts.items(), key=lambda item: (-item[1], item[0][1])):
+        pools[category][subtype] = count
+
+    return pools
+
+
+def main() -> None:
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+
+    output_path: str = sys.argv[2] if len(sys.argv) == 3 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "magic_the_gathering_type_pools.json"
+    )
+
+    with open(sys.argv[1], encoding="utf-8") as file:
+        pools: Dict[str, Dict[str, int]] = build_type_pools(file)
+
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(pools, file, ensure_ascii=False, indent=0, separators=(",", ":"))
+
+    for category, subtypes in pools.items():
+        print(f"{category}: {len(subtypes)} types, {sum(subtypes.values())} cards")
+
+
+if __name__ == "__main__":
+    main()
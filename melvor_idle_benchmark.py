@@ -0,0 +1,119 @@
+"""
+Benchmarks Melvor Idle objective generation under every combination of owned DLC.
+
+Run from the Archipelago root with: python -m worlds.keymasters_keep.games.melvor_idle_benchmark
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+
+from bisect import bisect_right
+from itertools import combinations
+from random import Random
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from .melvor_idle_game import (
+    MelvorIdleArchipelagoOptions,
+    MelvorIdleDLCOwned,
+    MelvorIdleGame,
+    MelvorIdleTieredRange,
+    QUICK_OBJECTIVE_MINUTES,
+    skill_level_costs,
+)
+
+
+POOLS: Tuple[str, ...] = (
+    "monsters",
+    "bosses",
+    "dungeons",
+    "events",
+    "skills",
+    "combat_skills",
+    "non_combat_skills",
+)
+
+OBJECTIVE_COUNT: int = 10_000
+REPEATS: int = 5
+
+
+def dlc_combinations() -> List[Tuple[str, ...]]:
+    keys: List[str] = MelvorIdleDLCOwned.valid_keys
+    return [combination for count in range(len(keys) + 1) for combination in combinations(keys, count)]
+
+
+def create_game(dlc_owned: Tuple[str, ...], seed: int = 0) -> MelvorIdleGame:
+    return MelvorIdleGame(
+        random=Random(seed),
+        archipelago_options=MelvorIdleArchipelagoOptions(
+            melvor_idle_dlc_owned=MelvorIdleDLCOwned(set(dlc_owned)),
+        ),
+    )
+
+
+def generate_objectives(game: MelvorIdleGame, count: int) -> List[str]:
+    table = game.objective_template_table
+    total_weight: int = table.cumulative_weights[-1]
+
+    objectives: List[str] = list()
+
+    for _ in range(count):
+        template = table.templates[bisect_right(table.cumulative_weights, game.random.random() * total_weight)]
+        objectives.append(template.generate_game_objective(game.random))
+
+    return objectives
+
+
+def time_us(function: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=REPEATS)) / number * 1_000_000
+
+
+def peak_allocation_kib(function: Callable[[], object]) -> float:
+    tracemalloc.start()
+
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 1024
+
+
+def benchmark(dlc_owned: Tuple[str, ...]) -> None:
+    # The first instance for a DLC combination pays for building the shared pools and template table
+    start: float = perf_counter()
+    create_game(dlc_owned).game_objective_templates()
+    first_build_us: float = (perf_counter() - start) * 1_000_000
+
+    game: MelvorIdleGame = create_game(dlc_owned)
+
+    print(f"DLC owned: {', '.join(dlc_owned) or 'None'}")
+    print(f"  first game_objective_templates(): {first_build_us:10.2f} us")
+    print(f"  game_objective_templates():       {time_us(game.game_objective_templates, number=10_000):10.2f} us")
+
+    for pool in POOLS:
+        method: Callable[[], Tuple[str, ...]] = getattr(game, pool)
+        print(f"  {pool + '():':<32}  {time_us(method, number=100_000):10.2f} us ({len(method())} entries)")
+
+    kill_counts: MelvorIdleTieredRange = game.kill_counts()
+    batch_us: float = time_us(lambda: kill_counts.draw_many(game.random, OBJECTIVE_COUNT), number=10)
+
+    print(f"  kill_counts().draw_many({OBJECTIVE_COUNT}):  {batch_us:10.2f} us")
+
+    levels: Tuple[int, ...] = game.levels()
+    split_us: float = time_us(lambda: skill_level_costs.split(levels, QUICK_OBJECTIVE_MINUTES), number=100_000)
+
+    print(f"  skill_level_costs.split():        {split_us:10.2f} us")
+
+    generation_s: float = time_us(lambda: generate_objectives(game, OBJECTIVE_COUNT), number=1) / 1_000_000
+    generation_kib: float = peak_allocation_kib(lambda: generate_objectives(game, OBJECTIVE_COUNT))
+
+    print(f"  {OBJECTIVE_COUNT} objectives:               {generation_s:10.4f} s, peak {generation_kib:.1f} KiB")
+
+
+if __name__ == "__main__":
+    for combination in dlc_combinations():
+        benchmark(combination)
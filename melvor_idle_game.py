@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Callable
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from array import array
+from bisect import bisect_left, bisect_right
 
 from dataclasses import dataclass
-from random import randint
+from functools import cached_property, lru_cache, partial
+from itertools import accumulate
+from math import floor
+from random import Random
+from sys import intern
 
 from Options import OptionSet
 
@@ -13,11 +20,336 @@ from ..game_objective_template import GameObjectiveTemplate
 from ..enums import KeymastersKeepGamePlatforms
 
 
+DLC_ATLAS_OF_DISCOVERY: int = 1 << 0
+DLC_THRONE_OF_THE_HERALD: int = 1 << 1
+DLC_INTO_THE_ABYSS: int = 1 << 2
+
+dlc_flags: Dict[str, int] = {
+    "Atlas of Discovery": DLC_ATLAS_OF_DISCOVERY,
+    "Throne of the Herald": DLC_THRONE_OF_THE_HERALD,
+    "Into the Abyss": DLC_INTO_THE_ABYSS,
+}
+
+
+def merge_unique(*groups: Iterable[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Concatenates groups keeping only the first occurrence of each name. Returns the merged names and the repeats.
+    """
+    seen: Set[str] = set()
+
+    merged: List[str] = list()
+    duplicates: List[str] = list()
+
+    for group in groups:
+        for name in group:
+            if name in seen:
+                duplicates.append(name)
+            else:
+                seen.add(name)
+                merged.append(name)
+
+    return tuple(merged), tuple(duplicates)
+
+
+def experience_table(max_level: int) -> Tuple[int, ...]:
+    """
+    Total experience required to reach each level, indexed by level. Levels 0 and 1 both require none.
+    """
+    table: List[int] = [0, 0]
+    points: int = 0
+
+    for level in range(1, max_level):
+        points += floor(level + 300 * 2 ** (level / 7))
+        table.append(points // 4)
+
+    return tuple(table)
+
+
+experience_by_level: Tuple[int, ...] = experience_table(120)
+
+
+class MelvorIdleCostIndex:
+    """
+    Estimated minutes to reach each value an objective can ask for, sorted by value. Costs grow with the value, so
+    the values that fit a time budget are always a prefix, found by bisection.
+    """
+    values: Tuple[int, ...]
+    minutes: Tuple[float, ...]
+
+    def __init__(self, values: Iterable[int], minutes_for: Callable[[int], float]) -> None:
+        self.values = tuple(sorted(set(values)))
+        self.minutes = tuple(minutes_for(value) for value in self.values)
+
+    def minutes_for(self, value: int) -> float:
+        return self.minutes[bisect_left(self.values, value)]
+
+    def split(self, values: Sequence[int], max_minutes: float) -> Tuple[Sequence[int], Sequence[int]]:
+        # Values must be sorted; ranges and tuples are split without being copied into a list
+        count: int = bisect_right(self.minutes, max_minutes)
+
+        if not count:
+            return values[:0], values
+
+        cut: int = bisect_right(values, self.values[count - 1])
+        return values[:cut], values[cut:]
+
+
+# Rough rates for an account part way through the game, only used to put objectives on one time scale
+SKILL_EXPERIENCE_PER_MINUTE: int = 1_000
+MINUTES_PER_KILL: float = 0.1
+MINUTES_PER_BOSS_KILL: float = 1.0
+
+# Objective values estimated to take longer than this are only offered by the time consuming templates
+QUICK_OBJECTIVE_MINUTES: float = 50.0
+
+skill_level_costs: MelvorIdleCostIndex = MelvorIdleCostIndex(
+    range(1, 121), lambda level: experience_by_level[level] / SKILL_EXPERIENCE_PER_MINUTE
+)
+
+kill_costs: MelvorIdleCostIndex = MelvorIdleCostIndex(range(1, 1001), lambda kills: kills * MINUTES_PER_KILL)
+boss_kill_costs: MelvorIdleCostIndex = MelvorIdleCostIndex(range(1, 1001), lambda kills: kills * MINUTES_PER_BOSS_KILL)
+
+
 @dataclass
 class MelvorIdleArchipelagoOptions:
     melvor_idle_dlc_owned: MelvorIdleDLCOwned
 
 
+class MelvorIdleEntityPools(NamedTuple):
+    monsters: Tuple[str, ...]
+    bosses: Tuple[str, ...]
+    dungeons: Tuple[str, ...]
+    events: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    combat_skills: Tuple[str, ...]
+    non_combat_skills: Tuple[str, ...]
+    duplicates: Dict[str, Tuple[str, ...]]  # Pool name -> names that were dropped from it as repeats
+
+
+class MelvorIdleSkillRegistry(NamedTuple):
+    base_skills: Tuple[str, ...]
+    into_the_abyss_combat_skills: Tuple[str, ...]
+    into_the_abyss_non_combat_skills: Tuple[str, ...]
+    into_the_abyss_skills: Tuple[str, ...]
+    abyssal_to_base: Dict[str, str]  # "Abyssal <skill>" -> "<skill>"; Corruption and Harvesting have no base skill
+    base_to_abyssal: Dict[str, str]
+
+
+class MelvorIdleTemplateTable(NamedTuple):
+    templates: Tuple[GameObjectiveTemplate, ...]
+    cumulative_weights: Tuple[int, ...]
+
+
+class MelvorIdleTieredRange:
+    """
+    Kill count tiers (low, medium, high) kept as ranges with cumulative weights. A tier is picked by weight and a
+    value by a uniform offset into it, so drawing never depends on how many values the tiers hold.
+    """
+    ranges: Tuple[range, ...]
+    weights: Tuple[float, ...]
+    cumulative_weights: Tuple[float, ...]
+
+    def __init__(self, *tiers: Tuple[range, float]) -> None:
+        self.ranges = tuple(numbers for numbers, _ in tiers)
+        self.weights = tuple(weight for _, weight in tiers)
+        self.cumulative_weights = tuple(accumulate(self.weights))
+
+    def draw(self, random: Random) -> int:
+        point: float = random.random() * self.cumulative_weights[-1]
+
+        index: int = bisect_right(self.cumulative_weights, point)
+        offset: float = point - (self.cumulative_weights[index - 1] if index else 0)
+
+        numbers: range = self.ranges[index]
+        return numbers[min(int(offset * len(numbers) / self.weights[index]), len(numbers) - 1)]
+
+    def draw_many(self, random: Random, k: int) -> List[int]:
+        tiers: List[range] = random.choices(self.ranges, cum_weights=self.cumulative_weights, k=k)
+        return [numbers[int(random.random() * len(numbers))] for numbers in tiers]
+
+    def split(
+        self, costs: MelvorIdleCostIndex, max_minutes: float
+    ) -> Tuple[MelvorIdleTieredRange, MelvorIdleTieredRange]:
+        # Each tier keeps its share of the weight on both sides, so the combined odds of every value are unchanged
+        quick: List[Tuple[range, float]] = list()
+        slow: List[Tuple[range, float]] = list()
+
+        for numbers, weight in zip(self.ranges, self.weights):
+            for part, tiers in zip(costs.split(numbers, max_minutes), (quick, slow)):
+                if part:
+                    tiers.append((part, weight * len(part) / len(numbers)))
+
+        return MelvorIdleTieredRange(*quick), MelvorIdleTieredRange(*slow)
+
+
+class MelvorIdleSkillLevels(Sequence):
+    """
+    Every "<level> in <skill>" pair of a skill and level pool, unranked from an index on demand instead of stored.
+    """
+    skills: Tuple[str, ...]
+    levels: Tuple[int, ...]
+
+    def __init__(self, skills: Sequence[str], levels: Sequence[int]) -> None:
+        self.skills = tuple(skills)
+        self.levels = tuple(levels)
+
+    def __len__(self) -> int:
+        return len(self.skills) * len(self.levels)
+
+    def __getitem__(self, index: int) -> str:
+        skill, level = divmod(range(len(self))[index], len(self.levels))
+        return f"{self.levels[level]} in {self.skills[skill]}"
+
+
+class MelvorIdleDistinctDraws:
+    """
+    Skill/level pairs for one world, one per call, with no pair repeated until every pair of the pool was drawn.
+
+    Each call is one step of a partial Fisher-Yates shuffle over the pool's indexes. Only displaced positions are
+    stored, so N draws cost O(N) however large the skill x level product is, and the product is never listed.
+    """
+    pool: Sequence[str]
+    random: Random
+    swaps: Dict[int, int]  # Position -> index, only for positions that no longer hold their own index
+    drawn: int
+
+    def __init__(self, pool: Sequence[str], random: Random) -> None:
+        self.pool = pool
+        self.random = random
+
+        self.swaps = dict()
+        self.drawn = 0
+
+    def __call__(self) -> Tuple[str]:
+        if self.drawn == len(self.pool):
+            self.swaps.clear()
+            self.drawn = 0
+
+        position: int = self.random.randrange(self.drawn, len(self.pool))
+        index: int = self.swaps.get(position, position)
+
+        # The first undrawn index takes the place of the one drawn, as in Fisher-Yates
+        self.swaps[position] = self.swaps.pop(self.drawn, self.drawn)
+        self.drawn += 1
+
+        return (self.pool[index],)
+
+
+class MelvorIdleMonsterCatalog:
+    """
+    Monsters and bosses of every DLC stored column-wise, one row per source list entry.
+
+    A boss that can also be fought as a regular monster has one row of each kind, sharing the same interned name.
+    """
+    names: Tuple[str, ...]
+    dlc: array  # DLC_* flag the row belongs to, 0 for the base game
+    is_boss: array
+    dungeon: array  # Index into dungeons, -1 when the row is not tied to a dungeon or event
+    dungeons: Tuple[str, ...]
+    dungeon_ids: Dict[str, int]
+
+    def __init__(
+        self,
+        monsters: Sequence[Tuple[int, Sequence[str]]],
+        bosses: Sequence[Tuple[int, Sequence[str]]],
+        dungeons: Sequence[str],
+        boss_dungeons: Dict[str, str],
+    ) -> None:
+        self.dungeons = tuple(dungeons)
+
+        self.dungeon_ids = {dungeon: i for i, dungeon in enumerate(self.dungeons)}
+
+        boss_dungeon_ids: Dict[str, int] = {
+            boss: self.dungeon_ids[dungeon] for boss, dungeon in boss_dungeons.items()
+        }
+
+        names: List[str] = list()
+
+        self.dlc = array("B")
+        self.is_boss = array("B")
+        self.dungeon = array("b")
+
+        for is_boss, groups in ((0, monsters), (1, bosses)):
+            for dlc, group in groups:
+                for name in group:
+                    names.append(intern(name))
+
+                    self.dlc.append(dlc)
+                    self.is_boss.append(is_boss)
+                    self.dungeon.append(boss_dungeon_ids.get(name, -1))
+
+        self.names = tuple(names)
+
+    def rows(self, dlc_mask: int, is_boss: bool, in_dungeon: bool = False) -> List[int]:
+        return [
+            row for row in range(len(self.names))
+            if self.is_boss[row] == is_boss
+            and not self.dlc[row] & ~dlc_mask
+            and (not in_dungeon or self.dungeon[row] >= 0)
+        ]
+
+    def select(self, dlc_mask: int, is_boss: bool, in_dungeon: bool = False) -> Tuple[str, ...]:
+        return tuple(self.names[row] for row in self.rows(dlc_mask, is_boss, in_dungeon))
+
+
+class MelvorIdleDungeonIndex:
+    """
+    Dungeon -> boss -> monster links between catalog rows owned under one DLC mask. Events count as dungeons here.
+
+    Bosses are stored in compressed sparse row form: the boss rows of dungeon i are
+    boss_rows[boss_offsets[i]:boss_offsets[i + 1]], with dungeon ids taken from the catalog.
+    """
+    catalog: MelvorIdleMonsterCatalog
+    boss_offsets: array
+    boss_rows: array
+    boss_dungeon: Dict[str, int]
+    reachable_bosses: FrozenSet[str]
+    boss_monster_row: Dict[str, int]  # Catalog row of a boss that can also be fought as a regular monster
+
+    def __init__(self, catalog: MelvorIdleMonsterCatalog, dlc_mask: int) -> None:
+        self.catalog = catalog
+
+        rows: List[int] = catalog.rows(dlc_mask, is_boss=True, in_dungeon=True)
+        rows.sort(key=lambda row: catalog.dungeon[row])
+
+        self.boss_rows = array("H", rows)
+        self.boss_offsets = array("H", [0] * (len(catalog.dungeons) + 1))
+
+        for row in rows:
+            self.boss_offsets[catalog.dungeon[row] + 1] += 1
+
+        for i in range(len(catalog.dungeons)):
+            self.boss_offsets[i + 1] += self.boss_offsets[i]
+
+        self.boss_dungeon = {catalog.names[row]: catalog.dungeon[row] for row in rows}
+
+        # Every boss whose DLC is owned, whether or not its dungeon is known
+        self.reachable_bosses = frozenset(catalog.select(dlc_mask, is_boss=True))
+
+        self.boss_monster_row = {
+            catalog.names[row]: row
+            for row in catalog.rows(dlc_mask, is_boss=False, in_dungeon=True)
+            if catalog.names[row] in self.boss_dungeon
+        }
+
+    def bosses_in(self, dungeon: str) -> Tuple[str, ...]:
+        dungeon_id: int = self.catalog.dungeon_ids[dungeon]
+        rows: array = self.boss_rows[self.boss_offsets[dungeon_id]:self.boss_offsets[dungeon_id + 1]]
+
+        return tuple(self.catalog.names[row] for row in rows)
+
+    def dungeon_of(self, boss: str) -> Optional[str]:
+        dungeon_id: Optional[int] = self.boss_dungeon.get(boss)
+
+        if dungeon_id is None:
+            return None
+
+        return self.catalog.dungeons[dungeon_id]
+
+    def is_boss_reachable(self, boss: str) -> bool:
+        return boss in self.reachable_bosses
+
+
 class MelvorIdleGame(Game):
     name = "Melvor Idle"
     platform = KeymastersKeepGamePlatforms.PC
@@ -42,74 +374,126 @@ class MelvorIdleGame(Game):
         ]
 
     def game_objective_templates(self) -> List[GameObjectiveTemplate]:
-        abyssal_objectives = [
+        return list(self.objective_template_table.templates)
+
+    @cached_property
+    def objective_template_table(self) -> MelvorIdleTemplateTable:
+        templates: List[GameObjectiveTemplate] = self.world_objective_templates()
+        templates.extend(self.shared_objective_templates(self.dlc_mask))
+
+        return MelvorIdleTemplateTable(
+            templates=tuple(templates),
+            cumulative_weights=tuple(accumulate(template.weight for template in templates)),
+        )
+
+    def world_objective_templates(self) -> List[GameObjectiveTemplate]:
+        # Templates whose values are drawn with this world's random or state, so they cannot be shared between games
+        templates: List[GameObjectiveTemplate] = [
             GameObjectiveTemplate(
-                label="Reach level LEVEL in SKILL",
+                label="Reach level SKILL_LEVEL",
                 data={
-                    "SKILL": (self.into_the_abyss_skills, 1),
-                    "LEVEL": (self.early_abyssal_levels, 1),
+                    "SKILL_LEVEL": (self.distinct_skill_levels(self.base_skills(), self.early_skill_levels()), 1),
                 },
-                is_time_consuming=True,
+                is_time_consuming=False,
                 is_difficult=False,
-                weight=2,
+                weight=5,
             ),
             GameObjectiveTemplate(
-                label="Reach level LEVEL in SKILL",
+                label="Reach level SKILL_LEVEL",
                 data={
-                    "SKILL": (self.into_the_abyss_skills, 1),
-                    "LEVEL": (self.late_abyssal_levels, 1),
+                    "SKILL_LEVEL": (self.distinct_skill_levels(self.skills(), self.late_skill_levels()), 1),
                 },
                 is_time_consuming=True,
                 is_difficult=False,
-                weight=1,
+                weight=2,
             ),
-        ]
-        return [
             GameObjectiveTemplate(
-                label="Reach level LEVEL in SKILL",
+                label="Kill NUMBER MONSTER",
                 data={
-                    "SKILL": (self.base_skills, 1),
-                    "LEVEL": (self.early_skill_levels, 1),
+                    "NUMBER": (partial(self.kill_count, kill_costs, False), 1),
+                    "MONSTER": (self.monsters, 1),
                 },
                 is_time_consuming=False,
                 is_difficult=False,
-                weight=5,
+                weight=3,
             ),
             GameObjectiveTemplate(
-                label="Reach level LEVEL in SKILL",
+                label="Kill NUMBER MONSTER",
                 data={
-                    "SKILL": (self.skills, 1),
-                    "LEVEL": (self.late_skill_levels, 1),
+                    "NUMBER": (partial(self.kill_count, kill_costs, True), 1),
+                    "MONSTER": (self.monsters, 1),
                 },
                 is_time_consuming=True,
                 is_difficult=False,
                 weight=2,
             ),
             GameObjectiveTemplate(
-                label="Kill NUMBER MONSTER",
+                label="Kill NUMBER BOSS",
                 data={
-                    "NUMBER": (self.random_range, 1),
-                    "MONSTER": (self.monsters, 1),
+                    "NUMBER": (partial(self.kill_count, boss_kill_costs, False), 1),
+                    "BOSS": (self.bosses, 1),
                 },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=5,
+                is_time_consuming=False,
+                is_difficult=True,
+                weight=1,
             ),
             GameObjectiveTemplate(
                 label="Kill NUMBER BOSS",
                 data={
-                    "NUMBER": (self.random_range, 1),
+                    "NUMBER": (partial(self.kill_count, boss_kill_costs, True), 1),
                     "BOSS": (self.bosses, 1),
                 },
                 is_time_consuming=True,
                 is_difficult=True,
-                weight=4,
+                weight=3,
             ),
+        ]
+
+        if self.has_dlc_into_the_abyss:
+            templates.extend([
+                GameObjectiveTemplate(
+                    label="Reach level SKILL_LEVEL",
+                    data={
+                        "SKILL_LEVEL": (
+                            self.distinct_skill_levels(self.into_the_abyss_skills(), self.early_abyssal_levels()),
+                            1,
+                        ),
+                    },
+                    is_time_consuming=True,
+                    is_difficult=False,
+                    weight=2,
+                ),
+                GameObjectiveTemplate(
+                    label="Reach level SKILL_LEVEL",
+                    data={
+                        "SKILL_LEVEL": (
+                            self.distinct_skill_levels(self.into_the_abyss_skills(), self.late_abyssal_levels()),
+                            1,
+                        ),
+                    },
+                    is_time_consuming=True,
+                    is_difficult=False,
+                    weight=1,
+                ),
+            ])
+
+        return templates
+
+    def distinct_skill_levels(self, skills: Sequence[str], levels: Sequence[int]) -> MelvorIdleDistinctDraws:
+        return MelvorIdleDistinctDraws(MelvorIdleSkillLevels(skills, levels), self.random)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def shared_objective_templates(dlc_mask: int) -> Tuple[GameObjectiveTemplate, ...]:
+        # Shared by every game with the same DLC, so no data callable may be bound to an instance
+        cls = MelvorIdleGame
+
+        return (
             GameObjectiveTemplate(
                 label="Reach mastery level in MASTERY in an item of your choice in SKILL",
                 data={
-                    "MASTERY": (self.mastery, 1),
-                    "SKILL": (self.non_combat_skills, 1),
+                    "MASTERY": (cls.mastery, 1),
+                    "SKILL": (partial(cls.pool, dlc_mask, "non_combat_skills"), 1),
                 },
                 is_time_consuming=True,
                 is_difficult=True,
@@ -118,8 +502,8 @@ class MelvorIdleGame(Game):
             GameObjectiveTemplate(
                 label="Complete DUNGEON NUMBER times",
                 data={
-                    "DUNGEON": (self.dungeons, 1),
-                    "NUMBER": (self.low_numbers, 1)
+                    "DUNGEON": (partial(cls.pool, dlc_mask, "dungeons"), 1),
+                    "NUMBER": (cls.low_numbers, 1)
                 },
                 is_time_consuming=True,
                 is_difficult=True,
@@ -128,72 +512,147 @@ class MelvorIdleGame(Game):
             GameObjectiveTemplate(
                 label="Complete EVENT once",
                 data={
-                    "EVENT": (self.events, 1)
+                    "EVENT": (partial(cls.pool, dlc_mask, "events"), 1)
                 },
                 is_time_consuming=True,
                 is_difficult=True,
                 weight=1,
             ),
-        ] + abyssal_objectives if self.has_dlc_into_the_abyss else []
+        )
 
     @property
     def dlc_owned(self) -> List[str]:
         return sorted(self.archipelago_options.melvor_idle_dlc_owned.value)
 
+    @cached_property
+    def dlc_mask(self) -> int:
+        # Resolved once per instance; the options are fixed for the lifetime of the game
+        mask: int = 0
+        for dlc in self.archipelago_options.melvor_idle_dlc_owned.value:
+            mask |= dlc_flags[dlc]
+        return mask
+
+    @property
+    def entity_pools(self) -> MelvorIdleEntityPools:
+        return self.entity_pools_for(self.dlc_mask)
+
+    @staticmethod
+    def pool(dlc_mask: int, pool_name: str) -> Tuple[str, ...]:
+        return getattr(MelvorIdleGame.entity_pools_for(dlc_mask), pool_name)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def entity_pools_for(dlc_mask: int) -> MelvorIdleEntityPools:
+        cls = MelvorIdleGame
+
+        catalog: MelvorIdleMonsterCatalog = cls.monster_catalog()
+        registry: MelvorIdleSkillRegistry = cls.skill_registry()
+
+        dungeon_list: List[str] = list(cls.base_dungeons())
+        event_list: List[str] = list(cls.base_events())
+        skill_list: List[str] = list(registry.base_skills)
+        combat_skill_list: List[str] = list(cls.base_combat_skills())
+        non_combat_skill_list: List[str] = list(cls.base_non_combat_skills())
+
+        if dlc_mask & DLC_ATLAS_OF_DISCOVERY:
+            dungeon_list.extend(cls.atlas_of_discovery_dungeons())
+            skill_list.extend(cls.atlas_of_discovery_skills())
+            non_combat_skill_list.extend(cls.atlas_of_discovery_skills())
+
+        if dlc_mask & DLC_THRONE_OF_THE_HERALD:
+            dungeon_list.extend(cls.throne_of_the_herald_dungeons())
+            event_list.extend(cls.throne_of_the_herald_events())
+
+        if dlc_mask & DLC_INTO_THE_ABYSS:
+            dungeon_list.extend(cls.into_the_abyss_dungeons())
+            event_list.extend(cls.into_the_abyss_events())
+            combat_skill_list.extend(registry.into_the_abyss_combat_skills)
+            non_combat_skill_list.extend(registry.into_the_abyss_non_combat_skills)
+
+        # Names listed by more than one source would otherwise be drawn more often than the rest of their pool
+        pools: Dict[str, Tuple[str, ...]] = dict()
+        duplicates: Dict[str, Tuple[str, ...]] = dict()
+
+        for pool_name, pool in (
+            ("monsters", catalog.select(dlc_mask, is_boss=False)),
+            ("bosses", catalog.select(dlc_mask, is_boss=True)),
+            ("dungeons", dungeon_list),
+            ("events", event_list),
+            ("skills", skill_list),
+            ("combat_skills", combat_skill_list),
+            ("non_combat_skills", non_combat_skill_list),
+        ):
+            pools[pool_name], pool_duplicates = merge_unique(pool)
+
+            if pool_duplicates:
+                duplicates[pool_name] = pool_duplicates
+
+        return MelvorIdleEntityPools(**pools, duplicates=duplicates)
+
     @property
     def has_dlc_throne_of_the_herald(self) -> bool:
-        return "Throne of the Herald" in self.dlc_owned
+        return bool(self.dlc_mask & DLC_THRONE_OF_THE_HERALD)
 
     @property
     def has_dlc_atlas_of_discovery(self) -> bool:
-        return "Atlas of Discovery" in self.dlc_owned
+        return bool(self.dlc_mask & DLC_ATLAS_OF_DISCOVERY)
 
     @property
     def has_dlc_into_the_abyss(self) -> bool:
-        return "Into the Abyss" in self.dlc_owned
+        return bool(self.dlc_mask & DLC_INTO_THE_ABYSS)
 
     @staticmethod
-    def game_modes() -> List[str]:
-        return [
+    def game_modes() -> Tuple[str, ...]:
+        return (
             "Normal",
             "Hardcore",
             "Adventure",
             "Ancient Relics",
-        ]
+        )
 
     @staticmethod
-    def base_game_levels() -> List[int]:
-        return [10, 20, 30, 40, 50, 60, 70, 80, 90, 99]
+    def base_game_levels() -> Tuple[int, ...]:
+        return (10, 20, 30, 40, 50, 60, 70, 80, 90, 99)
 
     @staticmethod
-    def dlc_levels() -> List[int]:
-        return [110, 120]
+    def dlc_levels() -> Tuple[int, ...]:
+        return (110, 120)
 
-    @property
-    def levels(self) -> List[int]:
-        if self.has_dlc_throne_of_the_herald:
-            return self.base_game_levels() + self.dlc_levels()
-        return self.base_game_levels()
+    def levels(self) -> Tuple[int, ...]:
+        return self.levels_for(self.dlc_mask)
 
-    @property
-    def early_skill_levels(self) -> List[int]:
-        return self.levels[:4]
+    def early_skill_levels(self) -> Tuple[int, ...]:
+        return self.early_skill_levels_for(self.dlc_mask)
 
-    @property
-    def late_skill_levels(self) -> List[int]:
-        return self.levels[4:]
+    def late_skill_levels(self) -> Tuple[int, ...]:
+        return self.late_skill_levels_for(self.dlc_mask)
 
     @staticmethod
-    def abyssal_levels() -> List[int]:
-        return [10, 20, 30, 40, 50, 60]
+    def levels_for(dlc_mask: int) -> Tuple[int, ...]:
+        if dlc_mask & DLC_THRONE_OF_THE_HERALD:
+            return MelvorIdleGame.base_game_levels() + MelvorIdleGame.dlc_levels()
+        return MelvorIdleGame.base_game_levels()
 
-    @property
-    def early_abyssal_levels(self) -> List[int]:
-        return self.abyssal_levels()[:2]
+    @staticmethod
+    def early_skill_levels_for(dlc_mask: int) -> Tuple[int, ...]:
+        return skill_level_costs.split(MelvorIdleGame.levels_for(dlc_mask), QUICK_OBJECTIVE_MINUTES)[0]
 
-    @property
-    def late_abyssal_levels(self) -> List[int]:
-        return self.abyssal_levels()[2:]
+    @staticmethod
+    def late_skill_levels_for(dlc_mask: int) -> Tuple[int, ...]:
+        return skill_level_costs.split(MelvorIdleGame.levels_for(dlc_mask), QUICK_OBJECTIVE_MINUTES)[1]
+
+    @staticmethod
+    def abyssal_levels() -> Tuple[int, ...]:
+        return (10, 20, 30, 40, 50, 60)
+
+    @staticmethod
+    def early_abyssal_levels() -> Tuple[int, ...]:
+        # Abyssal levels follow their own experience curve, which skill_level_costs does not cover
+        return MelvorIdleGame.abyssal_levels()[:2]
+
+    @staticmethod
+    def late_abyssal_levels() -> Tuple[int, ...]:
+        return MelvorIdleGame.abyssal_levels()[2:]
 
     @staticmethod
     def low_numbers() -> range:
@@ -207,22 +666,30 @@ class MelvorIdleGame(Game):
     def high_numbers() -> range:
         return range(250, 1001, 50)
 
-    @property
-    def random_range(self) -> range:
-        rand = randint(0, 100)
-        if rand > 75:
-            return self.low_numbers()
-        elif rand > 50:
-            return self.medium_numbers()
-        return self.high_numbers()
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def kill_counts() -> MelvorIdleTieredRange:
+        return MelvorIdleTieredRange(
+            (MelvorIdleGame.low_numbers(), 25),
+            (MelvorIdleGame.medium_numbers(), 25),
+            (MelvorIdleGame.high_numbers(), 50),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def kill_count_splits(costs: MelvorIdleCostIndex) -> Tuple[MelvorIdleTieredRange, MelvorIdleTieredRange]:
+        return MelvorIdleGame.kill_counts().split(costs, QUICK_OBJECTIVE_MINUTES)
+
+    def kill_count(self, costs: MelvorIdleCostIndex, is_time_consuming: bool) -> Tuple[int]:
+        return (self.kill_count_splits(costs)[is_time_consuming].draw(self.random),)
 
     @staticmethod
     def mastery() -> range:
         return range(2, 100)
 
     @staticmethod
-    def base_combat_skills() -> List[str]:
-        return [
+    def base_combat_skills() -> Tuple[str, ...]:
+        return (
             "Attack",
             "Defence",
             "Hitpoints",
@@ -231,11 +698,11 @@ class MelvorIdleGame(Game):
             "Ranged",
             "Slayer",
             "Strength",
-        ]
+        )
 
     @staticmethod
-    def base_non_combat_skills() -> List[str]:
-        return [
+    def base_non_combat_skills() -> Tuple[str, ...]:
+        return (
             "Agility",
             "Astrology",
             "Cooking",
@@ -253,68 +720,103 @@ class MelvorIdleGame(Game):
             "Thieving",
             "Township",
             "Woodcutting",
-        ]
+        )
 
-    @property
-    def base_skills(self) -> List[str]:
-        # Use list(set(...)) to deduplicate, but we need to sort it to ensure consistent ordering
-        return sorted(list(set(self.base_combat_skills() + self.base_non_combat_skills())))
+    def base_skills(self) -> Tuple[str, ...]:
+        return self.skill_registry().base_skills
 
     @staticmethod
-    def atlas_of_discovery_skills() -> List[str]:
-        return [
+    def atlas_of_discovery_skills() -> Tuple[str, ...]:
+        return (
             "Archaeology",
             "Cartography",
-        ]
+        )
 
-    @property
-    def into_the_abyss_combat_skills(self) -> List[str]:
-        return [
-            "Corruption",
-        ] + [
-            f'Abyssal {skill}' for skill in self.base_combat_skills()
-        ]
+    def into_the_abyss_combat_skills(self) -> Tuple[str, ...]:
+        return self.skill_registry().into_the_abyss_combat_skills
 
-    @property
-    def into_the_abyss_non_combat_skills(self) -> List[str]:
-        return [
-            "Harvesting",
-        ] + [
-            f'Abyssal {skill}' for skill in self.base_non_combat_skills()
-        ]
+    def into_the_abyss_non_combat_skills(self) -> Tuple[str, ...]:
+        return self.skill_registry().into_the_abyss_non_combat_skills
 
-    @property
-    def into_the_abyss_skills(self) -> List[str]:
-        return self.into_the_abyss_combat_skills + self.into_the_abyss_non_combat_skills
+    def into_the_abyss_skills(self) -> Tuple[str, ...]:
+        return self.skill_registry().into_the_abyss_skills
 
-    @property
-    def combat_skills(self) -> List[str]:
-        skill_list = self.base_combat_skills()[:]
-        if self.has_dlc_into_the_abyss:
-            skill_list.extend(self.into_the_abyss_combat_skills)
-        return skill_list
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def skill_registry() -> MelvorIdleSkillRegistry:
+        combat_skills: Tuple[str, ...] = MelvorIdleGame.base_combat_skills()
+        non_combat_skills: Tuple[str, ...] = MelvorIdleGame.base_non_combat_skills()
+
+        base_to_abyssal: Dict[str, str] = {
+            skill: intern(f"Abyssal {skill}") for skill in combat_skills + non_combat_skills
+        }
+
+        into_the_abyss_combat_skills: Tuple[str, ...] = ("Corruption",) + tuple(
+            base_to_abyssal[skill] for skill in combat_skills
+        )
+
+        into_the_abyss_non_combat_skills: Tuple[str, ...] = ("Harvesting",) + tuple(
+            base_to_abyssal[skill] for skill in non_combat_skills
+        )
+
+        return MelvorIdleSkillRegistry(
+            # Sorted so the deduplicated order is the same on every run
+            base_skills=tuple(sorted(set(combat_skills + non_combat_skills))),
+            into_the_abyss_combat_skills=into_the_abyss_combat_skills,
+            into_the_abyss_non_combat_skills=into_the_abyss_non_combat_skills,
+            # Abyssal Magic is both a combat and a non-combat skill, like Magic
+            into_the_abyss_skills=merge_unique(into_the_abyss_combat_skills, into_the_abyss_non_combat_skills)[0],
+            abyssal_to_base={abyssal: base for base, abyssal in base_to_abyssal.items()},
+            base_to_abyssal=base_to_abyssal,
+        )
+
+    def combat_skills(self) -> Tuple[str, ...]:
+        return self.entity_pools.combat_skills
+
+    def non_combat_skills(self) -> Tuple[str, ...]:
+        return self.entity_pools.non_combat_skills
+
+    def skills(self) -> Tuple[str, ...]:
+        return self.entity_pools.skills
 
-    @property
-    def non_combat_skills(self) -> List[str]:
-        skill_list = self.base_non_combat_skills()[:]
-        if self.has_dlc_atlas_of_discovery:
-            skill_list.extend(self.atlas_of_discovery_skills())
-        if self.has_dlc_into_the_abyss:
-            skill_list.extend(self.into_the_abyss_non_combat_skills)
-        return skill_list
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def monster_catalog() -> MelvorIdleMonsterCatalog:
+        cls = MelvorIdleGame
+
+        return MelvorIdleMonsterCatalog(
+            monsters=[
+                (0, cls.base_monsters()),
+                (DLC_ATLAS_OF_DISCOVERY, cls.atlas_of_discovery_monsters()),
+                (DLC_THRONE_OF_THE_HERALD, cls.throne_of_the_herald_monsters()),
+                (DLC_INTO_THE_ABYSS, cls.into_the_abyss_monsters()),
+            ],
+            bosses=[
+                (0, cls.base_game_bosses()),
+                (DLC_ATLAS_OF_DISCOVERY, cls.atlas_of_discovery_bosses()),
+                (DLC_THRONE_OF_THE_HERALD, cls.throne_of_the_herald_bosses()),
+                (DLC_INTO_THE_ABYSS, cls.into_the_abyss_bosses()),
+            ],
+            dungeons=(
+                cls.base_dungeons()
+                + cls.atlas_of_discovery_dungeons()
+                + cls.throne_of_the_herald_dungeons()
+                + cls.into_the_abyss_dungeons()
+                + cls.base_events()
+                + cls.throne_of_the_herald_events()
+                + cls.into_the_abyss_events()
+            ),
+            boss_dungeons=cls.boss_dungeons(),
+        )
 
-    @property
-    def skills(self) -> List[str]:
-        skill_list = self.base_skills[:]
-        if self.has_dlc_atlas_of_discovery:
-            skill_list.extend(self.atlas_of_discovery_skills())
-        if self.has_dlc_throne_of_the_herald:
-            skill_list.extend(self.into_the_abyss_skills)
-        return skill_list
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def dungeon_index(dlc_mask: int) -> MelvorIdleDungeonIndex:
+        return MelvorIdleDungeonIndex(MelvorIdleGame.monster_catalog(), dlc_mask)
 
     @staticmethod
-    def base_game_bosses() -> List[str]:
-        return [
+    def base_game_bosses() -> Tuple[str, ...]:
+        return (
             "Mumma Chicken",
             "Zombie Leader",
             "Bandit Leader",
@@ -332,21 +834,21 @@ class MelvorIdleGame(Game):
             "Ragnar",
             "Ahrenia",
             "Bane, Instrument of Fear",
-        ]
+        )
 
     @staticmethod
-    def atlas_of_discovery_bosses() -> List[str]:
-        return [
+    def atlas_of_discovery_bosses() -> Tuple[str, ...]:
+        return (
             "Lava Golem",
             "Furious Mahogany",
             "Puppet Master",
             "Soul Taker Witch",
             "Nagaia",
-        ]
+        )
 
     @staticmethod
-    def throne_of_the_herald_bosses() -> List[str]:
-        return [
+    def throne_of_the_herald_bosses() -> Tuple[str, ...]:
+        return (
             "Morellia",
             "Trogark",
             "RaZu, Lord of the Skies",
@@ -354,11 +856,11 @@ class MelvorIdleGame(Game):
             "Lady Darkheart",
             "Fiozor, the Ancient Necromancer",
             "The Herald",
-        ]
+        )
 
     @staticmethod
-    def into_the_abyss_bosses() -> List[str]:
-        return [
+    def into_the_abyss_bosses() -> Tuple[str, ...]:
+        return (
             "Abyssara, the Abyssal Warden",
             "Felth, the Toxic Martyr",
             "Karn, the Fear Bringer",
@@ -367,22 +869,14 @@ class MelvorIdleGame(Game):
             "Za-Kul, the Tendril Nightmare",
             "Nihlus, the Void Gazer",
             "Xon, the Abyssal King",
-        ]
+        )
 
-    @property
-    def bosses(self) -> List[str]:
-        boss_list = self.base_game_bosses()[:]
-        if self.has_dlc_atlas_of_discovery:
-            boss_list.extend(self.atlas_of_discovery_bosses())
-        if self.has_dlc_throne_of_the_herald:
-            boss_list.extend(self.throne_of_the_herald_bosses())
-        if self.has_dlc_into_the_abyss:
-            boss_list.extend(self.into_the_abyss_bosses())
-        return boss_list
+    def bosses(self) -> Tuple[str, ...]:
+        return self.entity_pools.bosses
 
     @staticmethod
-    def base_dungeons() -> List[str]:
-        return [
+    def base_dungeons() -> Tuple[str, ...]:
+        return (
             "Chicken Coop",
             "Undead Graveyard",
             "Bandit Base",
@@ -402,32 +896,32 @@ class MelvorIdleGame(Game):
             "Stronghold of Magic",
             "Stronghold of Dragons",
             "Stronghold of the Gods",
-        ]
+        )
 
     @staticmethod
-    def atlas_of_discovery_dungeons() -> List[str]:
-        return [
+    def atlas_of_discovery_dungeons() -> Tuple[str, ...]:
+        return (
             "Golem Territory",
             "Unholy Forest",
             "Trickery Temple",
             "Cult Grounds",
             "Underwater City",
-        ]
+        )
 
     @staticmethod
-    def throne_of_the_herald_dungeons() -> List[str]:
-        return [
+    def throne_of_the_herald_dungeons() -> Tuple[str, ...]:
+        return (
             "Ancient Sanctuary",
             "Underground Lava Lake",
             "Lightning Region",
             "Lair of the Spider Queen",
             "Cursed Forest",
             "Necromancers Palace",
-        ]
+        )
 
     @staticmethod
-    def into_the_abyss_dungeons() -> List[str]:
-        return [
+    def into_the_abyss_dungeons() -> Tuple[str, ...]:
+        return (
             "The Abyssal Approach",
             "Into the Abyss",
             "Depths of Woe",
@@ -441,50 +935,72 @@ class MelvorIdleGame(Game):
             "Stronghold of Fear",
             "Stronghold of Nightmares",
             "Stronghold of the Overlords",
-        ]
+        )
 
-    @property
-    def dungeons(self) -> List[str]:
-        dungeon_list = self.base_dungeons()[:]
-        if self.has_dlc_atlas_of_discovery:
-            dungeon_list.extend(self.atlas_of_discovery_dungeons())
-        if self.has_dlc_throne_of_the_herald:
-            dungeon_list.extend(self.throne_of_the_herald_dungeons())
-        if self.has_dlc_into_the_abyss:
-            dungeon_list.extend(self.into_the_abyss_dungeons())
-        return dungeon_list
+    def dungeons(self) -> Tuple[str, ...]:
+        return self.entity_pools.dungeons
 
     @staticmethod
-    def base_events() -> List[str]:
-        return [
+    def boss_dungeons() -> Dict[str, str]:
+        # Bosses that end a dungeon or event. Into the Abyss bosses are not mapped yet; they are still reachable through
+        # the catalog, but have no dungeon.
+        return {
+            "Mumma Chicken": "Chicken Coop",
+            "Zombie Leader": "Undead Graveyard",
+            "Bandit Leader": "Bandit Base",
+            "Elder Wizard": "Hall of Wizards",
+            "Spider King": "Spider Forest",
+            "Miolite Monarch": "Miolite Caves",
+            "The Kraken": "Deep Sea Ship",
+            "Protector of Ice": "Frozen Cove",
+            "Elder Dragon": "Dragons Den",
+            "Malcs, the Guardian of Melvor": "Volcanic Cave",
+            "Malcs, the Leader of Dragons": "Infernal Stronghold",
+            "Aeris": "Air God Dungeon",
+            "Glacia": "Water God Dungeon",
+            "Terran": "Earth God Dungeon",
+            "Ragnar": "Fire God Dungeon",
+            "Lava Golem": "Golem Territory",
+            "Furious Mahogany": "Unholy Forest",
+            "Puppet Master": "Trickery Temple",
+            "Soul Taker Witch": "Cult Grounds",
+            "Nagaia": "Underwater City",
+            "Morellia": "Ancient Sanctuary",
+            "Trogark": "Underground Lava Lake",
+            "RaZu, Lord of the Skies": "Lightning Region",
+            "Spider Queen": "Lair of the Spider Queen",
+            "Lady Darkheart": "Cursed Forest",
+            "Fiozor, the Ancient Necromancer": "Necromancers Palace",
+            "Ahrenia": "Into the Mist",
+            "Bane, Instrument of Fear": "Impending Darkness Event",
+            "The Herald": "Throne of the Herald",
+        }
+
+    @staticmethod
+    def base_events() -> Tuple[str, ...]:
+        return (
             "Into the Mist",
             "Impending Darkness Event",
-        ]
+        )
 
     @staticmethod
-    def throne_of_the_herald_events() -> List[str]:
-        return [
+    def throne_of_the_herald_events() -> Tuple[str, ...]:
+        return (
             "Throne of the Herald",
-        ]
+        )
 
     @staticmethod
-    def into_the_abyss_events() -> List[str]:
-        return [
+    def into_the_abyss_events() -> Tuple[str, ...]:
+        return (
             "The Final Depth",
-        ]
+        )
 
-    @property
-    def events(self) -> List[str]:
-        event_list = self.base_events()[:]
-        if self.has_dlc_throne_of_the_herald:
-            event_list.extend(self.throne_of_the_herald_events())
-        if self.has_dlc_into_the_abyss:
-            event_list.extend(self.into_the_abyss_events())
-        return event_list
+    def events(self) -> Tuple[str, ...]:
+        return self.entity_pools.events
 
     @staticmethod
-    def base_monsters() -> List[str]:
-        return [
+    def base_monsters() -> Tuple[str, ...]:
+        return (
             "Adamant Knight",
             "Adult Farmer",
             "Aeris",
@@ -654,11 +1170,11 @@ class MelvorIdleGame(Game):
             "Zombie Hand",
             "Zombie Leader",
             "Zombie",
-        ]
+        )
 
     @staticmethod
-    def atlas_of_discovery_monsters() -> List[str]:
-        return [
+    def atlas_of_discovery_monsters() -> Tuple[str, ...]:
+        return (
             "Angry Teak",
             "Blind Archer",
             "Blind Ghost",
@@ -702,11 +1218,11 @@ class MelvorIdleGame(Game):
             "Treacherous Jellyfish",
             "Tree Giant",
             "Tree Spirit",
-        ]
+        )
 
     @staticmethod
-    def throne_of_the_herald_monsters() -> List[str]:
-        return [
+    def throne_of_the_herald_monsters() -> Tuple[str, ...]:
+        return (
             "Alraune",
             "Arctair",
             "Banshee",
@@ -766,11 +1282,11 @@ class MelvorIdleGame(Game):
             "Vorloran Protector",
             "Vorloran Watcher",
             "Wicked Spider",
-        ]
+        )
 
     @staticmethod
-    def into_the_abyss_monsters() -> List[str]:
-        return [
+    def into_the_abyss_monsters() -> Tuple[str, ...]:
+        return (
             "Abyssal Bat",
             "Abyssal Chicken",
             "Abyssal Cow",
@@ -869,18 +1385,10 @@ class MelvorIdleGame(Game):
             # "Xon, the Abyssal King (Phase 2)",
             # "Xon, the Abyssal King (Phase 3)",
             "Za-Kul, the Tendril Nightmare",
-        ]
+        )
 
-    @property
-    def monsters(self) -> List[str]:
-        monster_list = self.base_monsters()[:]
-        if self.has_dlc_atlas_of_discovery:
-            monster_list.extend(self.atlas_of_discovery_monsters())
-        if self.has_dlc_throne_of_the_herald:
-            monster_list.extend(self.throne_of_the_herald_monsters())
-        if self.has_dlc_into_the_abyss:
-            monster_list.extend(self.into_the_abyss_monsters())
-        return monster_list
+    def monsters(self) -> Tuple[str, ...]:
+        return self.entity_pools.monsters
 
 
 # Archipelago Options
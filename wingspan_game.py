@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 
 from Options import OptionSet
 
@@ -17,6 +18,53 @@ class WingspanArchipelagoOptions:
     wingspan_expansions_owned: WingspanExpansionsOwned
 
 
+EXPANSION_ASIA: int = 1 << 0
+EXPANSION_EUROPEAN: int = 1 << 1
+EXPANSION_OCEANIA: int = 1 << 2
+
+expansion_flags: Dict[str, int] = {
+    "Asia": EXPANSION_ASIA,
+    "European": EXPANSION_EUROPEAN,
+    "Oceania": EXPANSION_OCEANIA,
+}
+
+
+class WingspanGoal(NamedTuple):
+    label: str
+    expansion: Optional[str] = None  # None for goals from the base game
+    nest_type: Optional[str] = None
+    habitat: Optional[str] = None
+    action: Optional[str] = None
+
+
+# Bonus objectives that work against an end-of-round goal, keyed by the goal
+WINGSPAN_GOAL_BONUS_CONFLICTS: Dict[str, Tuple[str, ...]] = {
+    "Most birds with no eggs": (
+        "Birds with at least 4 eggs laid on them",
+        "Birds that have at least 1 egg laid on them",
+        "Birds with completely full nests",
+    ),
+    "Most birds worth over 4 points": (
+        "Birds worth less than 4 points",
+    ),
+    "Most food cost on birds": (
+        "Birds with a food cost of 2 or less",
+    ),
+    "Most food in your personal supply": (
+        "Fish and rodent tokens cached on birds",
+    ),
+}
+
+
+class WingspanPools(NamedTuple):
+    food_types: Tuple[str, ...]
+    end_of_round_goals: Tuple[WingspanGoal, ...]
+    end_of_round_goal_labels: Tuple[str, ...]
+    bonus_objectives: Tuple[str, ...]
+    # Bit j of row i is set when bonus objective j can be paired with end-of-round goal i
+    goal_bonus_compatibility: Tuple[int, ...]
+    pairable_goal_indexes: Tuple[int, ...]
+
 
 class WingspanGame(Game):
     name = "Wingspan"
@@ -41,7 +89,7 @@ class WingspanGame(Game):
             GameObjectiveTemplate(
                 label="Starting goals: GOALS",
                 data={
-                    "GOALS": (self.end_of_round_goals, 4)
+                    "GOALS": (self.starting_goals, 1)
                 },
             ),
         ]
@@ -64,6 +112,15 @@ class WingspanGame(Game):
                 is_difficult=False,
                 weight=4,
             ),
+            GameObjectiveTemplate(
+                label="In one game, PAIRING",
+                data={
+                    "PAIRING": (self.goal_bonus_pairs, 1),
+                },
+                is_time_consuming=True,
+                is_difficult=False,
+                weight=2,
+            ),
             GameObjectiveTemplate(
                 label="At the end of game, have the GOAL",
                 data={
@@ -86,7 +143,7 @@ class WingspanGame(Game):
             GameObjectiveTemplate(
                 label="Achieve one additional bonus objective: BONUS",
                 data={
-                    "BONUS": (self.bonus_objectives, 3),
+                    "BONUS": (self.bonus_objective_sets, 1),
                 },
                 is_time_consuming=True,
                 is_difficult=False,
@@ -94,21 +151,111 @@ class WingspanGame(Game):
             ),
         ]
 
+    @cached_property
+    def index_arrays(self) -> Dict[int, List[int]]:
+        # Pool size -> index permutation reused by sample_distinct
+        return dict()
+
+    def sample_distinct(self, pool: Sequence[str], k: int) -> List[str]:
+        """
+        Draws k distinct entries from pool with a partial Fisher-Yates shuffle over a reused index array.
+        """
+        indexes: Optional[List[int]] = self.index_arrays.get(len(pool))
+
+        if indexes is None:
+            indexes = self.index_arrays[len(pool)] = list(range(len(pool)))
+
+        # The array stays a permutation between draws, so it never needs resetting
+        for i in range(k):
+            j: int = self.random.randrange(i, len(indexes))
+            indexes[i], indexes[j] = indexes[j], indexes[i]
+
+        return [pool[index] for index in indexes[:k]]
+
+    def goal_bonus_pairs(self) -> Tuple[str]:
+        pools: WingspanPools = self.pools
+
+        goal_index: int = self.random.choice(pools.pairable_goal_indexes)
+        row: int = pools.goal_bonus_compatibility[goal_index]
+
+        # Clear the lowest set bits until the randomly chosen compatible bonus objective is the lowest one left
+        for _ in range(self.random.randrange(row.bit_count())):
+            row &= row - 1
+
+        goal: str = pools.end_of_round_goal_labels[goal_index]
+        bonus: str = pools.bonus_objectives[(row & -row).bit_length() - 1]
+
+        return (f"win a round with '{goal}' as your goal and achieve the bonus objective '{bonus}' at game end",)
+
+    def starting_goals(self) -> Tuple[str]:
+        return (", ".join(self.sample_distinct(self.end_of_round_goals(), 4)),)
+
+    def bonus_objective_sets(self) -> Tuple[str]:
+        return (", ".join(self.sample_distinct(self.bonus_objectives(), 3)),)
+
     @property
     def expansions_owned(self) -> List[str]:
         return sorted(self.archipelago_options.wingspan_expansions_owned.value)
 
+    @cached_property
+    def expansion_mask(self) -> int:
+        # Resolved once per instance; the options are fixed for the lifetime of the game
+        mask: int = 0
+        for expansion in self.archipelago_options.wingspan_expansions_owned.value:
+            mask |= expansion_flags[expansion]
+        return mask
+
+    @cached_property
+    def pools(self) -> WingspanPools:
+        return self.expansion_pools(self.expansion_mask)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def expansion_pools(expansion_mask: int) -> WingspanPools:
+        goals: Tuple[WingspanGoal, ...] = WingspanGame.end_of_round_goal_pool(expansion_mask)
+
+        food_types: List[str] = WingspanGame.base_food_types()
+        if expansion_mask & EXPANSION_OCEANIA:
+            food_types = food_types + WingspanGame.oceania_food_types()
+
+        bonus_objectives: Tuple[str, ...] = tuple(WingspanGame.all_bonus_objectives())
+        compatibility: Tuple[int, ...] = WingspanGame.goal_bonus_compatibility(goals, bonus_objectives)
+
+        return WingspanPools(
+            food_types=tuple(food_types),
+            end_of_round_goals=goals,
+            end_of_round_goal_labels=tuple(goal.label for goal in goals),
+            bonus_objectives=bonus_objectives,
+            goal_bonus_compatibility=compatibility,
+            pairable_goal_indexes=tuple(index for index, row in enumerate(compatibility) if row),
+        )
+
+    @staticmethod
+    def goal_bonus_compatibility(goals: Tuple[WingspanGoal, ...], bonus_objectives: Tuple[str, ...]) -> Tuple[int, ...]:
+        all_bonuses: int = (1 << len(bonus_objectives)) - 1
+        bonus_bits: Dict[str, int] = {label: 1 << index for index, label in enumerate(bonus_objectives)}
+
+        rows: List[int] = list()
+
+        for goal in goals:
+            row: int = all_bonuses
+            for label in WINGSPAN_GOAL_BONUS_CONFLICTS.get(goal.label, ()):
+                row &= ~bonus_bits[label]
+            rows.append(row)
+
+        return tuple(rows)
+
     @property
     def has_asia_expansion(self) -> bool:
-        return "Asia" in self.expansions_owned
+        return bool(self.expansion_mask & EXPANSION_ASIA)
 
     @property
     def has_european_expansion(self) -> bool:
-        return "European" in self.expansions_owned
+        return bool(self.expansion_mask & EXPANSION_EUROPEAN)
 
     @property
     def has_oceania_expansion(self) -> bool:
-        return "Oceania" in self.expansions_owned
+        return bool(self.expansion_mask & EXPANSION_OCEANIA)
 
     @staticmethod
     def board_columns() -> range:
@@ -138,11 +285,8 @@ class WingspanGame(Game):
             "nectar",
         ]
 
-    def food_types(self) -> List[str]:
-        food = self.base_food_types()[:]
-        if self.has_oceania_expansion:
-            food.extend(self.oceania_food_types())
-        return food
+    def food_types(self) -> Tuple[str, ...]:
+        return self.pools.food_types
 
     @staticmethod
     def habitats() -> List[str]:
@@ -162,39 +306,57 @@ class WingspanGame(Game):
             "wild"
         ]
 
-    def end_of_round_goals(self) -> List[str]:
-        return [
-            f"Most birds with {nest_type} nest type with an egg" for nest_type in self.nest_types()
-        ] + [
-            f"Most birds in {habitat}" for habitat in self.habitats()
-        ] + [
-            f"Most eggs in {nest_type}" for nest_type in self.nest_types()
+    def end_of_round_goals(self) -> Tuple[str, ...]:
+        return self.pools.end_of_round_goal_labels
+
+    @staticmethod
+    def end_of_round_goal_pool(expansion_mask: int) -> Tuple[WingspanGoal, ...]:
+        nest_types: List[str] = WingspanGame.nest_types()
+        habitats: List[str] = WingspanGame.habitats()
+
+        goals: List[WingspanGoal] = [
+            WingspanGoal(f"Most birds with {nest_type} nest type with an egg", nest_type=nest_type)
+            for nest_type in nest_types
         ] + [
-            f"Most eggs in {habitat}" for habitat in self.habitats()
+            WingspanGoal(f"Most birds in {habitat}", habitat=habitat) for habitat in habitats
         ] + [
-            f"Most birds with a beak pointing {direction}" for direction in ["left", "right"]
+            WingspanGoal(f"Most eggs in {nest_type}", nest_type=nest_type) for nest_type in nest_types
         ] + [
-            f"Most cubes on '{action}' action" for action in [
-                "Play a Bird",
-                "Gather Food",
-                "Lay Eggs",
-                "Draw Cards",
-            ]
+            WingspanGoal(f"Most eggs in {habitat}", habitat=habitat) for habitat in habitats
         ] + [
-            "Most birds"
-            "Most sets of eggs (1 in each habitat type)"
-            "Most food in your personal supply",
-            "Most bird cards in hand",
-            "Most birds worth over 4 points",
-            "Most birds with no eggs",
-            "Most birds in one row",
-            "Most filled columns",
-            "Most birds with a brown 'when activated' power",
-            "Most birds with either no power of a 'when played' power",
-            "Most birds with a tucked card",
-            "Most food cost on birds",
+            WingspanGoal("Most birds"),
+            WingspanGoal("Most sets of eggs (1 in each habitat type)"),
         ]
 
+        if expansion_mask & EXPANSION_EUROPEAN:
+            goals.extend(
+                WingspanGoal(label, expansion="European") for label in (
+                    "Most food in your personal supply",
+                    "Most bird cards in hand",
+                    "Most birds worth over 4 points",
+                    "Most birds with no eggs",
+                    "Most birds in one row",
+                    "Most filled columns",
+                    "Most birds with a brown 'when activated' power",
+                    "Most birds with either no power of a 'when played' power",
+                    "Most birds with a tucked card",
+                    "Most food cost on birds",
+                )
+            )
+
+        if expansion_mask & EXPANSION_OCEANIA:
+            goals.extend(
+                WingspanGoal(f"Most birds with a beak pointing {direction}", expansion="Oceania")
+                for direction in ("left", "right")
+            )
+
+            goals.extend(
+                WingspanGoal(f"Most cubes on '{action}' action", expansion="Oceania", action=action)
+                for action in ("Play a Bird", "Gather Food", "Lay Eggs", "Draw Cards")
+            )
+
+        return tuple(goals)
+
     @staticmethod
     def game_end_points() -> List[str]:
         return [
@@ -206,7 +368,11 @@ class WingspanGame(Game):
             "most tucked cards",
         ]
 
-    def bonus_objectives(self) -> List[str]:
+    def bonus_objectives(self) -> Tuple[str, ...]:
+        return self.pools.bonus_objectives
+
+    @staticmethod
+    def all_bonus_objectives() -> List[str]:
         return [
             "Birds with colors in their names",
             "Birds with body parts in their names",
@@ -230,9 +396,9 @@ class WingspanGame(Game):
             "Fish and rodent tokens cached on birds",
             "Birds that allow you to score or draw more bonus cards",
         ] + [
-            f"Different nest types in {habitat}" for habitat in self.habitats()
+            f"Different nest types in {habitat}" for habitat in WingspanGame.habitats()
         ] + [
-            f"Consecutive birds in {habitat} with ascending or descending scores" for habitat in self.habitats()
+            f"Consecutive birds in {habitat} with ascending or descending scores" for habitat in WingspanGame.habitats()
         ]
 
 